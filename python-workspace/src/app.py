@@ -19,6 +19,14 @@ USE_OLLAMA = os.getenv("USE_OLLAMA", "false").lower() == "true"
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://192.168.68.123:11434/v1")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gpt-oss:20b")
 
+# Cascade: try OLLAMA_SMALL_MODEL first, escalate to OLLAMA_MODEL when its answer fails the checks
+USE_CASCADE = os.getenv("OLLAMA_CASCADE", "false").lower() == "true"
+OLLAMA_SMALL_MODEL = os.getenv("OLLAMA_SMALL_MODEL", "phi4-mini")
+CASCADE_CHECKS = os.getenv("CASCADE_CHECKS", "tool_calls,non_empty,confidence")
+CASCADE_MIN_CONFIDENCE = os.getenv("CASCADE_MIN_CONFIDENCE", "0.7")
+CASCADE_SMALL_TIMEOUT = os.getenv("CASCADE_SMALL_TIMEOUT", "30")
+CASCADE_STATS_PATH = os.getenv("CASCADE_STATS_PATH", "cascade_stats.json")
+
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -30,7 +38,16 @@ with st.sidebar:
     st.title("⚙️ Settings")
     
     # Model info
-    st.info(f"**Model**: {OLLAMA_MODEL}\n\n**Endpoint**: {OLLAMA_URL}")
+    if USE_CASCADE:
+        st.info(f"**Model**: {OLLAMA_SMALL_MODEL} → {OLLAMA_MODEL} (cascade)\n\n**Endpoint**: {OLLAMA_URL}")
+    else:
+        st.info(f"**Model**: {OLLAMA_MODEL}\n\n**Endpoint**: {OLLAMA_URL}")
+    
+    # Cascade hit rates and latency savings
+    if USE_CASCADE:
+        from cascade import CascadeStats
+        with st.expander("📊 Cascade Stats"):
+            st.json(CascadeStats(CASCADE_STATS_PATH).snapshot())
     
     # Reasoning toggle
     st.session_state.show_reasoning = st.checkbox(
@@ -81,6 +98,7 @@ if prompt := st.chat_input("Ask me anything..."):
                 # Import tools
                 from strands_tools import calculator, current_time
                 from strands_tools.tavily import tavily_search
+                from cascade import CascadeStats, ModelCascade, cascade_settings
                 import asyncio
                 
                 # Get callable functions
@@ -184,17 +202,18 @@ if prompt := st.chat_input("Ask me anything..."):
                 reasoning_steps = []
                 max_iterations = 5
                 
+                cascade = ModelCascade(
+                    small_model=OLLAMA_SMALL_MODEL if USE_CASCADE else None,
+                    large_model=OLLAMA_MODEL,
+                    api_base=OLLAMA_URL,
+                    completion_func=completion,
+                    **(cascade_settings(CASCADE_CHECKS, CASCADE_MIN_CONFIDENCE, CASCADE_SMALL_TIMEOUT) if USE_CASCADE else {})
+                )
+                
                 # Tool calling loop
                 try:
                     for iteration in range(max_iterations):
-                        response = completion(
-                            model=f"openai/{OLLAMA_MODEL}",
-                            messages=messages,
-                            api_base=OLLAMA_URL,
-                            api_key="not-needed",
-                            tools=tools,
-                            timeout=120
-                        )
+                        response = cascade.complete(messages=messages, tools=tools, timeout=120)
                         
                         assistant_message = response.choices[0].message
                         
@@ -289,6 +308,15 @@ if prompt := st.chat_input("Ask me anything..."):
                     
                     # Save assistant response with reasoning
                     assistant_msg = {"role": "assistant", "content": final_answer}
+                    if USE_CASCADE:
+                        reasoning_steps.append({
+                            "type": "cascade",
+                            "model": cascade.model,
+                            "tier": cascade.tier,
+                            "escalation_reason": cascade.escalation_reason,
+                            "seconds": cascade.seconds,
+                            "calls": cascade.calls
+                        })
                     if reasoning_steps:
                         assistant_msg["reasoning"] = reasoning_steps
                     st.session_state.messages.append(assistant_msg)
@@ -310,6 +338,10 @@ if prompt := st.chat_input("Ask me anything..."):
                         st.session_state.messages.append({"role": "assistant", "content": final_answer})
                     else:
                         raise
+                else:
+                    # The no-tools fallback bypasses the cascade, so only cascade-answered questions are recorded
+                    if USE_CASCADE:
+                        cascade.finish(CascadeStats(CASCADE_STATS_PATH))
             else:
                 # AWS Bedrock path
                 from strands import Agent
@@ -0,0 +1,284 @@
+"""
+Small-to-large model cascade for the Ollama path.
+
+Every question is first sent to a fast small model with the same tools list.
+Each small-model response is checked with cheap validity signals:
+
+- tool_calls: every tool call names an offered tool and its arguments parse as a JSON object
+- non_empty: a final answer actually contains text
+- confidence: the model's self-rated confidence meets CASCADE_MIN_CONFIDENCE
+
+As soon as a check fails (or the small model errors), the rejected response is
+dropped and the question continues on the large model. Per-tier hit rates and
+latency are accumulated in a JSON stats file.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+DEFAULT_CHECKS = ("tool_calls", "non_empty", "confidence")
+
+CONFIDENCE_PROMPT = (
+    "When you give your final answer, end it with a separate last line of the form "
+    "'Confidence: X', where X is a number between 0 and 1 rating how sure you are "
+    "that the answer is correct. Do not add this line when calling a tool."
+)
+
+# Matches "Confidence: 0.9" at the end of a line, tolerating markdown bold, an
+# enclosing "(...)" / "[...]" and trailing punctuation such as "Confidence: 0.9."
+CONFIDENCE_PATTERN = re.compile(r"[(\[]?[ \t]*\**confidence\**[ \t]*[:=][ \t]*\**[ \t]*(\d*\.?\d+)[ \t]*(%?)[ \t*)\].!,;]*$",
+                                re.IGNORECASE | re.MULTILINE)
+
+
+def parse_checks(value):
+    """Parse a comma-separated CASCADE_CHECKS value into a tuple of check names."""
+    checks = tuple(name.strip().lower() for name in value.split(",") if name.strip())
+    unknown = [name for name in checks if name not in DEFAULT_CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown cascade checks: {', '.join(unknown)} (expected any of {', '.join(DEFAULT_CHECKS)})")
+    return checks
+
+
+def cascade_settings(checks, min_confidence, small_timeout):
+    """
+    Parse and validate the CASCADE_* environment values.
+
+    Only called when the cascade is enabled, so a bad value never affects the
+    plain Ollama or Bedrock paths.
+
+    Returns:
+        Keyword arguments for ModelCascade
+    """
+    try:
+        min_confidence = float(min_confidence)
+    except ValueError:
+        raise ValueError(f"CASCADE_MIN_CONFIDENCE must be a number, got {min_confidence!r}") from None
+    if not 0 <= min_confidence <= 1:
+        raise ValueError(f"CASCADE_MIN_CONFIDENCE must be between 0 and 1, got {min_confidence}")
+    try:
+        small_timeout = float(small_timeout)
+    except ValueError:
+        raise ValueError(f"CASCADE_SMALL_TIMEOUT must be a number of seconds, got {small_timeout!r}") from None
+    if small_timeout <= 0:
+        raise ValueError(f"CASCADE_SMALL_TIMEOUT must be positive, got {small_timeout}")
+    return {"checks": parse_checks(checks), "min_confidence": min_confidence, "small_timeout": small_timeout}
+
+
+def extract_confidence(content):
+    """
+    Split a self-rated confidence line off an answer.
+
+    Returns:
+        (answer without the confidence line, confidence in 0-1 or None if missing)
+    """
+    if not content:
+        return content, None
+    matches = list(CONFIDENCE_PATTERN.finditer(content))
+    if not matches:
+        return content, None
+    match = matches[-1]
+    answer = (content[:match.start()] + content[match.end():]).strip()
+    value = match.group(1)
+    confidence = float(value)
+    # "85%" and "85" are percentages; other values outside 0-1 (e.g. "1.5") are unreadable
+    if match.group(2) or (confidence > 1 and "." not in value):
+        confidence /= 100
+    if confidence > 1:
+        return answer, None
+    return answer, confidence
+
+
+class ModelCascade:
+    """
+    Routes the completion calls of a single question through the small and large tiers.
+
+    Create one instance per question, use `complete()` in place of `litellm.completion`,
+    then call `finish()` to record the outcome. With no small model configured every
+    call goes straight to the large model and nothing is recorded.
+
+    `small_timeout` caps each small-model call so a stalled small model escalates
+    quickly instead of using the full timeout meant for the large model.
+    """
+
+    def __init__(self, small_model, large_model, api_base, checks=DEFAULT_CHECKS,
+                 min_confidence=0.7, small_timeout=None, completion_func=None):
+        if completion_func is None:
+            from litellm import completion as completion_func
+        self.small_model = small_model
+        self.large_model = large_model
+        self.api_base = api_base
+        self.checks = tuple(checks)
+        self.min_confidence = min_confidence
+        self.small_timeout = small_timeout
+        self.completion_func = completion_func
+        self.tier = "small" if small_model else "large"
+        self.escalation_reason = None
+        self.seconds = {"small": 0.0, "large": 0.0}
+        self.calls = {"small": 0, "large": 0}
+
+    @property
+    def model(self):
+        """Model currently answering the question."""
+        return self.small_model if self.tier == "small" else self.large_model
+
+    def complete(self, messages, tools=None, timeout=120):
+        """Drop-in replacement for `completion()` that escalates on failed checks."""
+        if self.tier == "small":
+            try:
+                small_timeout = min(timeout, self.small_timeout) if self.small_timeout else timeout
+                response = self._call("small", self._small_messages(messages), tools, small_timeout)
+            except Exception:
+                self._escalate("error")
+            else:
+                reason = self._failed_check(response, tools)
+                if reason is None:
+                    return response
+                self._escalate(reason)
+        return self._call("large", messages, tools, timeout)
+
+    def finish(self, stats):
+        """Record this question's outcome in `stats` (a CascadeStats) and return the snapshot."""
+        if not self.small_model:
+            return None
+        return stats.record(self.tier, self.escalation_reason, self.seconds, self.calls)
+
+    def _call(self, tier, messages, tools, timeout):
+        model = self.small_model if tier == "small" else self.large_model
+        kwargs = {"tools": tools} if tools else {}
+        start = time.perf_counter()
+        try:
+            return self.completion_func(
+                model=f"openai/{model}",
+                messages=messages,
+                api_base=self.api_base,
+                api_key="not-needed",
+                timeout=timeout,
+                **kwargs
+            )
+        finally:
+            self.seconds[tier] += time.perf_counter() - start
+            self.calls[tier] += 1
+
+    def _small_messages(self, messages):
+        if "confidence" not in self.checks:
+            return messages
+        return [{"role": "system", "content": CONFIDENCE_PROMPT}] + list(messages)
+
+    def _escalate(self, reason):
+        self.tier = "large"
+        self.escalation_reason = reason
+
+    def _failed_check(self, response, tools):
+        """Return the name of the first failed check, or None if the response is accepted."""
+        message = response.choices[0].message
+        tool_calls = getattr(message, "tool_calls", None)
+
+        if tool_calls:
+            if "tool_calls" in self.checks:
+                offered = {tool["function"]["name"] for tool in tools or []}
+                for tool_call in tool_calls:
+                    if tool_call.function.name not in offered:
+                        return "tool_calls"
+                    try:
+                        arguments = json.loads(tool_call.function.arguments or "{}")
+                    except (TypeError, ValueError):
+                        return "tool_calls"
+                    if not isinstance(arguments, dict):
+                        return "tool_calls"
+            # Tool-call turns carry no final answer to rate; drop any stray confidence line
+            if message.content:
+                message.content, _ = extract_confidence(message.content)
+            return None
+
+        answer, confidence = extract_confidence(message.content)
+        message.content = answer
+        if "non_empty" in self.checks and not (answer or "").strip():
+            return "non_empty"
+        if "confidence" in self.checks and (confidence is None or confidence < self.min_confidence):
+            return "confidence"
+        return None
+
+
+class CascadeStats:
+    """
+    Per-tier hit rates and latency, persisted to a JSON file so they accumulate across runs.
+
+    `estimated_seconds_saved` compares the cascade with sending every call to the
+    large model. Each completion call made by a small-tier hit is assumed to cost
+    the large model's average per-call latency, and all time spent on the small
+    tier (including calls of escalated questions) is subtracted. There is no
+    large-only baseline: the per-call average is only observed on escalated turns,
+    which tend to carry longer, tool-heavy contexts, so the figure leans high.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Read the raw counters, starting from zero if the file does not exist yet."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        data.setdefault("questions", 0)
+        data.setdefault("escalations", {})
+        tiers = data.setdefault("tiers", {})
+        for name in ("small", "large"):
+            tier = tiers.setdefault(name, {})
+            for counter in ("answered", "seconds", "calls", "answered_calls"):
+                tier.setdefault(counter, 0)
+        return data
+
+    def record(self, answered_by, escalation_reason, seconds, calls):
+        """Add one question's outcome and return the updated snapshot."""
+        with self._lock:
+            data = self.load()
+            data["questions"] += 1
+            data["tiers"][answered_by]["answered"] += 1
+            data["tiers"][answered_by]["answered_calls"] += calls[answered_by]
+            for tier, elapsed in seconds.items():
+                data["tiers"][tier]["seconds"] += elapsed
+                data["tiers"][tier]["calls"] += calls[tier]
+            if escalation_reason:
+                data["escalations"][escalation_reason] = data["escalations"].get(escalation_reason, 0) + 1
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        return self.snapshot(data)
+
+    def snapshot(self, data=None):
+        """Counters plus derived hit rates, average latencies and estimated savings."""
+        data = data if data is not None else self.load()
+        questions = data["questions"]
+        small = data["tiers"]["small"]
+        large = data["tiers"]["large"]
+
+        tiers = {}
+        for name, tier in data["tiers"].items():
+            tiers[name] = {
+                **tier,
+                "hit_rate": tier["answered"] / questions if questions else 0.0,
+            }
+        # Small-tier time is spent on every question; large-tier time only on escalations
+        tiers["small"]["avg_seconds"] = small["seconds"] / questions if questions else None
+        tiers["large"]["avg_seconds"] = large["seconds"] / large["answered"] if large["answered"] else None
+        for name, tier in data["tiers"].items():
+            tiers[name]["avg_call_seconds"] = tier["seconds"] / tier["calls"] if tier["calls"] else None
+
+        saved = None
+        if tiers["large"]["avg_call_seconds"] is not None:
+            saved = small["answered_calls"] * tiers["large"]["avg_call_seconds"] - small["seconds"]
+
+        return {
+            "questions": questions,
+            "tiers": tiers,
+            "escalations": data["escalations"],
+            "estimated_seconds_saved": saved,
+        }
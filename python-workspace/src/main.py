@@ -9,6 +9,14 @@ USE_OLLAMA = os.getenv("USE_OLLAMA", "false").lower() == "true"
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://192.168.68.123:11434/v1")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "phi4")
 
+# Cascade: try OLLAMA_SMALL_MODEL first, escalate to OLLAMA_MODEL when its answer fails the checks
+USE_CASCADE = os.getenv("OLLAMA_CASCADE", "false").lower() == "true"
+OLLAMA_SMALL_MODEL = os.getenv("OLLAMA_SMALL_MODEL", "phi4-mini")
+CASCADE_CHECKS = os.getenv("CASCADE_CHECKS", "tool_calls,non_empty,confidence")
+CASCADE_MIN_CONFIDENCE = os.getenv("CASCADE_MIN_CONFIDENCE", "0.7")
+CASCADE_SMALL_TIMEOUT = os.getenv("CASCADE_SMALL_TIMEOUT", "30")
+CASCADE_STATS_PATH = os.getenv("CASCADE_STATS_PATH", "cascade_stats.json")
+
 # Prompt user for question
 print("=" * 60)
 print("AI Assistant")
@@ -24,11 +32,15 @@ if USE_OLLAMA:
     from litellm import completion
     from strands_tools import calculator, current_time
     from strands_tools.tavily import tavily_search
+    from cascade import CascadeStats, ModelCascade, cascade_settings
     import json
     import asyncio
     
     print(f"\nUsing Ollama at {OLLAMA_URL}")
-    print(f"Model: {OLLAMA_MODEL}")
+    if USE_CASCADE:
+        print(f"Model: {OLLAMA_SMALL_MODEL} -> {OLLAMA_MODEL} (cascade)")
+    else:
+        print(f"Model: {OLLAMA_MODEL}")
     print(f"\nProcessing your question...")
     
     # Get the actual callable functions from the modules
@@ -128,18 +140,19 @@ if USE_OLLAMA:
     messages = [{"role": "user", "content": message}]
     max_iterations = 5
     
+    cascade = ModelCascade(
+        small_model=OLLAMA_SMALL_MODEL if USE_CASCADE else None,
+        large_model=OLLAMA_MODEL,
+        api_base=OLLAMA_URL,
+        completion_func=completion,
+        **(cascade_settings(CASCADE_CHECKS, CASCADE_MIN_CONFIDENCE, CASCADE_SMALL_TIMEOUT) if USE_CASCADE else {})
+    )
+    
     # Try with tools first, fallback to no tools if model doesn't support them
     try:
         for iteration in range(max_iterations):
             print(f"  [Iteration {iteration + 1}/{max_iterations}]")
-            response = completion(
-                model=f"openai/{OLLAMA_MODEL}",
-                messages=messages,
-                api_base=OLLAMA_URL,
-                api_key="not-needed",
-                tools=tools,
-                timeout=120
-            )
+            response = cascade.complete(messages=messages, tools=tools, timeout=120)
             
             assistant_message = response.choices[0].message
             
@@ -231,14 +244,8 @@ if USE_OLLAMA:
                 "content": "Based on the information you gathered, please provide a concise final answer to my original question. Do not use any more tools."
             })
             print(f"  [Calling model for final answer...]")
-            response = completion(
-                model=f"openai/{OLLAMA_MODEL}",
-                messages=messages,
-                api_base=OLLAMA_URL,
-                api_key="not-needed",
-                timeout=60
-                # Don't include tools parameter to prevent more tool calls
-            )
+            # Don't include tools parameter to prevent more tool calls
+            response = cascade.complete(messages=messages, timeout=60)
             print(f"  [Got response]")
             print(f"\nQuestion: {message}")
             final_answer = response.choices[0].message.content
@@ -263,6 +270,17 @@ if USE_OLLAMA:
             print(f"Answer: {response.choices[0].message.content}")
         else:
             raise
+    else:
+        # The no-tools fallback bypasses the cascade, so only cascade-answered questions are recorded
+        if USE_CASCADE:
+            stats = cascade.finish(CascadeStats(CASCADE_STATS_PATH))
+            small_stats = stats["tiers"]["small"]
+            saved = stats["estimated_seconds_saved"]
+            print(f"\n[Cascade] Answered by {cascade.tier} model ({cascade.model})"
+                  + (f", escalated: {cascade.escalation_reason}" if cascade.escalation_reason else ""))
+            print(f"[Cascade] Small-model hit rate: {small_stats['hit_rate']:.0%} over {stats['questions']} questions"
+                  + (f", est. {saved:.1f}s saved" if saved is not None else ""))
+            print(f"[Cascade] Stats written to {CASCADE_STATS_PATH}")
     
 else:
     # Use strands Agent with AWS Bedrock
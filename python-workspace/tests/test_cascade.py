@@ -0,0 +1,181 @@
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cascade import CascadeStats, ModelCascade, cascade_settings, extract_confidence, parse_checks
+
+
+TOOLS = [{"type": "function", "function": {"name": "calculator", "parameters": {}}}]
+
+
+def make_response(content=None, tool_calls=None):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.choices[0].message.tool_calls = tool_calls
+    return response
+
+
+def make_tool_call(name, arguments):
+    tool_call = MagicMock()
+    tool_call.function.name = name
+    tool_call.function.arguments = arguments
+    return tool_call
+
+
+def make_cascade(responses, **kwargs):
+    """Build a cascade whose completion returns responses keyed by model name"""
+    completion = MagicMock(side_effect=lambda model, **_: responses[model])
+    cascade = ModelCascade("small", "large", "http://test.local:11434/v1",
+                           completion_func=completion, **kwargs)
+    return cascade, completion
+
+
+def test_confident_small_answer_is_accepted():
+    """Test that a confident small-model answer is returned without calling the large model"""
+    cascade, completion = make_cascade({"openai/small": make_response("42\nConfidence: 0.9")})
+
+    response = cascade.complete(messages=[{"role": "user", "content": "6*7?"}], tools=TOOLS)
+
+    assert response.choices[0].message.content == "42"
+    assert cascade.tier == "small"
+    completion.assert_called_once()
+    assert completion.call_args.kwargs["messages"][0]["role"] == "system"
+
+
+@pytest.mark.parametrize("small_response, reason", [
+    (make_response("42\nConfidence: 0.3"), "confidence"),
+    (make_response("42"), "confidence"),
+    (make_response("Confidence: 0.9"), "non_empty"),
+    (make_response(tool_calls=[make_tool_call("calculator", "{not json")]), "tool_calls"),
+    (make_response(tool_calls=[make_tool_call("unknown_tool", "{}")]), "tool_calls"),
+])
+def test_failed_check_escalates(small_response, reason):
+    """Test that failing a check hands the question to the large model"""
+    large_response = make_response("42")
+    cascade, completion = make_cascade({"openai/small": small_response, "openai/large": large_response})
+
+    response = cascade.complete(messages=[{"role": "user", "content": "6*7?"}], tools=TOOLS)
+
+    assert response is large_response
+    assert cascade.tier == "large"
+    assert cascade.escalation_reason == reason
+    assert completion.call_count == 2
+
+    # Once escalated, the rest of the question stays on the large model
+    cascade.complete(messages=[{"role": "user", "content": "6*7?"}], tools=TOOLS)
+    assert completion.call_args.kwargs["model"] == "openai/large"
+
+
+@pytest.mark.parametrize("error", [TimeoutError("Request timed out"), RuntimeError("connection refused")])
+def test_small_model_error_escalates(error):
+    """Test that a small-model timeout or exception escalates with reason error"""
+    large_response = make_response("42")
+
+    def completion(model, **kwargs):
+        if model == "openai/small":
+            raise error
+        return large_response
+
+    cascade = ModelCascade("small", "large", "http://test.local:11434/v1",
+                           small_timeout=10, completion_func=MagicMock(side_effect=completion))
+
+    response = cascade.complete(messages=[{"role": "user", "content": "6*7?"}], tools=TOOLS, timeout=120)
+
+    assert response is large_response
+    assert cascade.tier == "large"
+    assert cascade.escalation_reason == "error"
+    small_call, large_call = cascade.completion_func.call_args_list
+    assert small_call.kwargs["timeout"] == 10
+    assert large_call.kwargs["timeout"] == 120
+
+
+def test_disabled_checks_are_skipped():
+    """Test that only the configured checks can trigger escalation"""
+    cascade, completion = make_cascade({"openai/small": make_response("42")}, checks=parse_checks("non_empty"))
+
+    cascade.complete(messages=[{"role": "user", "content": "6*7?"}])
+
+    assert cascade.tier == "small"
+    assert "system" not in [m["role"] for m in completion.call_args.kwargs["messages"]]
+
+
+def test_extract_confidence_formats():
+    """Test that common confidence line formats are parsed and stripped"""
+    assert extract_confidence("Answer\nConfidence: 0.85") == ("Answer", 0.85)
+    assert extract_confidence("Answer\n**Confidence:** 85%") == ("Answer", 0.85)
+    assert extract_confidence("Answer\nConfidence: 85") == ("Answer", 0.85)
+    assert extract_confidence("Answer\nConfidence: 0.9.") == ("Answer", 0.9)
+    assert extract_confidence("Answer (Confidence: 0.9)") == ("Answer", 0.9)
+    assert extract_confidence("Answer [confidence = 0.9]!") == ("Answer", 0.9)
+    assert extract_confidence("Answer") == ("Answer", None)
+
+
+def test_extract_confidence_out_of_range():
+    """Test that values outside 0-1 that are not percentages are treated as missing"""
+    assert extract_confidence("Answer\nConfidence: 1.5") == ("Answer", None)
+    assert extract_confidence("Answer\nConfidence: 150%") == ("Answer", None)
+    assert extract_confidence("Answer\nConfidence: 1") == ("Answer", 1.0)
+
+
+def test_parse_checks_rejects_unknown():
+    """Test that typos in CASCADE_CHECKS are reported"""
+    with pytest.raises(ValueError):
+        parse_checks("tool_calls,confidnce")
+
+
+@pytest.mark.parametrize("min_confidence", ["high", "1.5", "-0.1"])
+def test_cascade_settings_rejects_bad_min_confidence(min_confidence):
+    """Test that CASCADE_MIN_CONFIDENCE must be a number between 0 and 1"""
+    with pytest.raises(ValueError):
+        cascade_settings("confidence", min_confidence, "30")
+
+
+@pytest.mark.parametrize("small_timeout", ["soon", "0", "-5"])
+def test_cascade_settings_rejects_bad_small_timeout(small_timeout):
+    """Test that CASCADE_SMALL_TIMEOUT must be a positive number of seconds"""
+    with pytest.raises(ValueError):
+        cascade_settings("confidence", "0.7", small_timeout)
+
+
+def test_cascade_settings_parses_values():
+    """Test that valid CASCADE_* values become ModelCascade keyword arguments"""
+    assert cascade_settings("non_empty, confidence", "0.5", "15") == {
+        "checks": ("non_empty", "confidence"),
+        "min_confidence": 0.5,
+        "small_timeout": 15.0,
+    }
+
+
+def test_stats_hit_rates_and_savings(tmp_path):
+    """Test that per-tier hit rates and estimated savings accumulate across records"""
+    stats = CascadeStats(str(tmp_path / "cascade_stats.json"))
+
+    stats.record("small", None, {"small": 1.0, "large": 0.0}, {"small": 1, "large": 0})
+    stats.record("small", None, {"small": 2.0, "large": 0.0}, {"small": 2, "large": 0})
+    snapshot = stats.record("large", "confidence", {"small": 1.0, "large": 12.0}, {"small": 1, "large": 3})
+
+    assert snapshot["questions"] == 3
+    assert snapshot["tiers"]["small"]["hit_rate"] == pytest.approx(2 / 3)
+    assert snapshot["tiers"]["large"]["avg_seconds"] == pytest.approx(12.0)
+    assert snapshot["tiers"]["large"]["avg_call_seconds"] == pytest.approx(4.0)
+    assert snapshot["escalations"] == {"confidence": 1}
+    # 3 calls by small hits * 4s per large call - 4s total spent on the small tier
+    assert snapshot["estimated_seconds_saved"] == pytest.approx(8.0)
+    assert CascadeStats(stats.path).snapshot() == snapshot
+
+
+def test_finish_records_calls_per_tier(tmp_path):
+    """Test that finish() passes the per-tier call counts of an escalated question to the stats"""
+    cascade, _ = make_cascade({"openai/small": make_response("42"), "openai/large": make_response("42")})
+    cascade.complete(messages=[{"role": "user", "content": "6*7?"}])
+    cascade.complete(messages=[{"role": "user", "content": "6*7?"}])
+
+    snapshot = cascade.finish(CascadeStats(str(tmp_path / "cascade_stats.json")))
+
+    assert snapshot["tiers"]["small"]["calls"] == 1
+    assert snapshot["tiers"]["large"]["calls"] == 2
+    assert snapshot["tiers"]["large"]["answered_calls"] == 2